@@ -23,7 +23,7 @@ from newsroom.utils import get_user_dict, get_company_dict, get_entity_or_404, p
 from newsroom.utils import get_local_date, get_end_date
 from datetime import datetime
 from newsroom.wire import url_for_wire
-from newsroom.search import BaseSearchService, SearchQuery, query_string
+from newsroom.search import BaseSearchService, SearchQuery, query_string, invalidate_search_cache
 from .utils import get_latest_available_delivery, TO_BE_CONFIRMED_FIELD
 
 
@@ -561,6 +561,13 @@ class AgendaService(BaseSearchService):
     limit_days_setting = None
     default_sort = [{'dates.start': 'asc'}]
     default_page_size = 100
+    cache_products_filter = False  # apply_product_filter also collects planning items filters
+
+    def on_updated(self, updates, original):
+        invalidate_search_cache()
+
+    def on_deleted(self, doc):
+        invalidate_search_cache()
 
     def on_fetched(self, doc):
         self.enhance_items(doc[config.ITEMS])
@@ -696,20 +703,16 @@ class AgendaService(BaseSearchService):
             _remove_fields(search.source, PLANNING_ITEMS_FIELDS)
 
     def apply_product_filter(self, search, product):
-        """ Generate the filter for a single product
+        """ Generate the planning items filter for a single product
 
         :param newsroom.search.SearchQuery search: The search query instance
         :param dict product: The product to filter
         :return:
         """
-        if search.args.get('requested_products') and product['_id'] not in search.args['requested_products']:
+        if not self.is_product_requested(search, product):
             return
 
         if product.get('query'):
-            search.query['bool']['should'].append(
-                query_string(product['query'])
-            )
-
             if product.get('planning_item_query') and not search.is_events_only:
                 search.planning_items_should.append(
                     planning_items_query_string(
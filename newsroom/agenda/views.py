@@ -3,7 +3,6 @@ import json
 import flask
 from flask import current_app as app, request
 from flask_babel import gettext
-from eve.methods.get import get_internal
 from eve.render import send_response
 from eve.utils import ParsedRequest
 from superdesk import get_resource_service
@@ -22,6 +21,7 @@ from newsroom.agenda.email import send_coverage_request_email
 from newsroom.agenda.utils import remove_fields_for_public_user
 from newsroom.companies import section, get_user_company
 from newsroom.notifications import push_user_notification
+from newsroom.search import get_internal_search
 
 
 @blueprint.route('/agenda')
@@ -87,7 +87,7 @@ def item(_id):
 @blueprint.route('/agenda/search')
 @login_required
 def search():
-    response = get_internal('agenda')
+    response = get_internal_search('agenda')
     return send_response('agenda', response)
 
 
@@ -3,7 +3,6 @@ import logging
 import flask
 from flask import current_app as app
 from eve.render import send_response
-from eve.methods.get import get_internal
 from superdesk import get_resource_service
 
 from newsroom.am_news import blueprint
@@ -15,6 +14,7 @@ from newsroom.wire.search import get_bookmarks_count
 from newsroom.wire.views import update_action_list, get_previous_versions, set_permissions
 from newsroom.utils import get_json_or_400, get_entity_or_404, is_json_request, get_type
 from newsroom.notifications import push_user_notification
+from newsroom.search import get_internal_search
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +46,7 @@ def index():
 @blueprint.route('/am_news/search')
 @login_required
 def search():
-    response = get_internal('am_news_search')
+    response = get_internal_search('am_news_search')
     return send_response('am_news_search', response)
 
 
@@ -11,6 +11,7 @@ from werkzeug.exceptions import NotFound
 
 from newsroom.decorator import admin_only, account_manager_only, login_required
 from newsroom.companies import blueprint
+from newsroom.products.products import invalidate_products_cache
 from newsroom.utils import query_resource, find_one, get_entity_or_404, get_json_or_400, set_original_creator, \
     set_version_creator
 
@@ -150,6 +151,7 @@ def update_products(updates, company_id):
             db.update_one({'_id': product['_id']}, {'$addToSet': {'companies': company_id}})
         else:
             db.update_one({'_id': product['_id']}, {'$pull': {'companies': company_id}})
+    invalidate_products_cache()
 
 
 def update_company(data, _id):
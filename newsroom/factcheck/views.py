@@ -2,7 +2,6 @@ import flask
 import logging
 from flask import current_app as app
 from eve.render import send_response
-from eve.methods.get import get_internal
 
 from superdesk import get_resource_service
 from newsroom.factcheck import blueprint
@@ -13,6 +12,7 @@ from newsroom.wire.search import get_bookmarks_count
 from newsroom.wire.views import update_action_list, get_previous_versions, set_permissions
 from newsroom.utils import get_json_or_400, get_entity_or_404, is_json_request, get_type
 from newsroom.notifications import push_user_notification
+from newsroom.search import get_internal_search
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +43,7 @@ def index():
 @login_required
 @section('factcheck')
 def search():
-    response = get_internal('factcheck_search')
+    response = get_internal_search('factcheck_search')
     return send_response('factcheck_search', response)
 
 
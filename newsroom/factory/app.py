@@ -8,6 +8,7 @@ This module implements WSGI application extending eve.Eve
 import os
 import pathlib
 import importlib
+import threading
 
 import eve
 import flask
@@ -28,6 +29,9 @@ from newsroom.gettext import setup_babel
 
 NEWSROOM_DIR = pathlib.Path(__file__).resolve().parent.parent
 
+# (path, mtime) of the logging config file applied in this process
+_logging_config_applied = None
+
 
 class BaseNewsroomApp(eve.Eve):
     """The base Newsroom app class"""
@@ -46,10 +50,15 @@ class BaseNewsroomApp(eve.Eve):
         self.babel_tzinfo = None
         self.babel_locale = None
         self.babel_translations = None
-        self.mail = None
-        self.cache = None
         self.static_folder = None
 
+        # mail, cache and media storage are initialised on first access,
+        # so processes which never use them (cli, workers) don't pay for it
+        self._mail = None
+        self._cache = None
+        self._media = None
+        self._lazy_setup_lock = threading.RLock()
+
         super(BaseNewsroomApp, self).__init__(
             import_name,
             data=self.DATALAYER,
@@ -57,6 +66,7 @@ class BaseNewsroomApp(eve.Eve):
             template_folder=os.path.join(NEWSROOM_DIR, 'templates'),
             static_folder=os.path.join(NEWSROOM_DIR, 'static'),
             validator=SuperdeskValidator,
+            media=None,
             **kwargs
         )
         self.json_encoder = SuperdeskJSONEncoder
@@ -68,21 +78,20 @@ class BaseNewsroomApp(eve.Eve):
             except TypeError:
                 self.config.from_object(config)
 
+            # eve might have touched the media storage before the config was updated
+            self.media = None
+
         newsroom.flask_app = self
         self.settings = self.config
 
-        self.setup_media_storage()
         self.setup_babel()
         self.setup_blueprints(self.config['BLUEPRINTS'])
         self.setup_apps(self.config['CORE_APPS'])
         if not self.config.get("BEHAVE"):
             # workaround for core 2.3 adding planning to installed apps
             self.setup_apps(self.config.get('INSTALLED_APPS', []))
-        self.setup_email()
-        self.setup_cache()
         self.setup_error_handlers()
-
-        configure_logging(self.config.get('LOG_CONFIG_FILE'))
+        self.setup_logging()
 
     def load_app_default_config(self):
         """
@@ -112,6 +121,42 @@ class BaseNewsroomApp(eve.Eve):
         self.load_app_default_config()
         self.load_app_instance_config()
 
+    @property
+    def media(self):
+        if self._media is None:
+            with self._lazy_setup_lock:
+                if self._media is None:
+                    self.setup_media_storage()
+        return self._media
+
+    @media.setter
+    def media(self, media):
+        self._media = media
+
+    @property
+    def mail(self):
+        if self._mail is None:
+            with self._lazy_setup_lock:
+                if self._mail is None:
+                    self.setup_email()
+        return self._mail
+
+    @mail.setter
+    def mail(self, mail):
+        self._mail = mail
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            with self._lazy_setup_lock:
+                if self._cache is None:
+                    self.setup_cache()
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache):
+        self._cache = cache
+
     def setup_media_storage(self):
         if self.config.get('AMAZON_CONTAINER_NAME'):
             self.media = AmazonMediaStorage(self)
@@ -150,6 +195,20 @@ class BaseNewsroomApp(eve.Eve):
     def setup_cache(self):
         self.cache = Cache(self)
 
+    def setup_logging(self):
+        """Configure logging, unless the same config file was already applied in this process."""
+        global _logging_config_applied
+
+        file_path = self.config.get('LOG_CONFIG_FILE')
+        try:
+            config_id = (file_path, os.path.getmtime(file_path)) if file_path else None
+        except OSError:
+            config_id = None
+
+        if config_id is None or config_id != _logging_config_applied:
+            configure_logging(file_path)
+            _logging_config_applied = config_id
+
     def setup_error_handlers(self):
         def assertion_error(err):
             return flask.jsonify({'error': err.args[0] if err.args else 1}), 400
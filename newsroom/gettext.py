@@ -1,3 +1,4 @@
+import functools
 
 from babel import core
 from flask import request, current_app, session
@@ -11,9 +12,14 @@ def get_client_translations(domain='client'):
     return {key: val for key, val in translations._catalog.items() if key and val}
 
 
+@functools.lru_cache()
+def get_locale_display_name(locale):
+    return core.Locale(locale).display_name
+
+
 def get_client_locales():
     return [
-        {'locale': locale, 'name': core.Locale(locale).display_name} for locale in current_app.config['LANGUAGES']
+        {'locale': locale, 'name': get_locale_display_name(locale)} for locale in current_app.config['LANGUAGES']
     ]
 
 
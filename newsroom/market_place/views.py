@@ -1,7 +1,6 @@
 import flask
 from flask import current_app as app
 from eve.render import send_response
-from eve.methods.get import get_internal
 
 from superdesk import get_resource_service
 from newsroom.market_place import blueprint, SECTION_ID, SECTION_NAME
@@ -14,6 +13,7 @@ from newsroom.wire.search import get_bookmarks_count
 from newsroom.wire.views import update_action_list, get_previous_versions, set_permissions
 from newsroom.utils import get_json_or_400, get_entity_or_404, is_json_request, get_type, query_resource
 from newsroom.notifications import push_user_notification
+from newsroom.search import get_internal_search
 
 
 search_endpoint_name = '{}_search'.format(SECTION_ID)
@@ -83,7 +83,7 @@ def home():
 @blueprint.route('/{}/search'.format(SECTION_ID))
 @login_required
 def search():
-    response = get_internal(search_endpoint_name)
+    response = get_internal_search(search_endpoint_name)
     return send_response(search_endpoint_name, response)
 
 
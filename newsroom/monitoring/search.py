@@ -61,9 +61,10 @@ class MonitoringSearchService(WireSearchService):
         """
 
         if not search.is_admin:
-            if search.args.get('requested_products'):
+            if search.requested_products:
                 # Ensure that all the provided products are permissioned for this request
-                if not all(p in [c.get('_id') for c in search.products] for p in search.args['requested_products']):
+                allowed = {str(c.get('_id')) for c in search.products}
+                if not allowed.issuperset(str(_id) for _id in search.requested_products):
                     abort(404, gettext('Invalid product parameter'))
 
     def apply_products_filter(self, search):
@@ -9,7 +9,7 @@ from superdesk import get_resource_service
 
 from newsroom.decorator import admin_only
 from newsroom.navigations import blueprint
-from newsroom.products.products import get_products_by_navigation
+from newsroom.products.products import get_products_by_navigation, invalidate_products_cache
 from newsroom.utils import get_json_or_400, get_entity_or_404, query_resource, set_original_creator, set_version_creator
 from newsroom.upload import get_file
 
@@ -93,6 +93,7 @@ def delete(_id):
     products = get_products_by_navigation(_id)
     for product in products:
         db.update_one({'_id': product['_id']}, {'$pull': {'navigations': _id}})
+    invalidate_products_cache()
 
     get_resource_service('navigations').delete_action({'_id': ObjectId(_id)})
     return jsonify({'success': True}), 200
@@ -111,5 +112,6 @@ def save_navigation_products(_id):
             db.update_one({'_id': product['_id']}, {'$addToSet': {'navigations': _id}})
         else:
             db.update_one({'_id': product['_id']}, {'$pull': {'navigations': _id}})
+    invalidate_products_cache()
 
     return jsonify(), 200
@@ -1,8 +1,16 @@
+import hashlib
+
 from bson import ObjectId
+from flask import current_app as app
 
 import newsroom
 import superdesk
 
+from newsroom.utils import get_cache_version, bump_cache_version, get_cache_timeout
+
+PRODUCTS_CACHE_VERSION_KEY = 'products_cache_version'
+DEFAULT_PRODUCTS_CACHE_TIMEOUT = 60  # in sec, used with a shared cache if not configured
+
 
 class ProductsResource(newsroom.Resource):
     """
@@ -56,7 +64,43 @@ class ProductsResource(newsroom.Resource):
 
 
 class ProductsService(newsroom.Service):
-    pass
+    def on_created(self, docs):
+        invalidate_products_cache()
+
+    def on_updated(self, updates, original):
+        invalidate_products_cache()
+
+    def on_deleted(self, doc):
+        invalidate_products_cache()
+
+
+def get_products_cache_version():
+    """Get the current version of products data, to be used in products related cache keys"""
+    return get_cache_version(PRODUCTS_CACHE_VERSION_KEY)
+
+
+def get_cached_products(lookup):
+    """Get the list of products matching the lookup, using the cache if enabled
+
+    :param dict lookup: Mongo lookup for products
+    """
+    timeout = get_cache_timeout('PRODUCTS_CACHE_TIMEOUT', DEFAULT_PRODUCTS_CACHE_TIMEOUT)
+    if not timeout:
+        return list(superdesk.get_resource_service('products').get(req=None, lookup=lookup))
+
+    cache_key = 'products_{}'.format(
+        hashlib.sha256(str((get_products_cache_version(), lookup)).encode('utf-8')).hexdigest()
+    )
+    products = app.cache.get(cache_key)
+    if products is None:
+        products = list(superdesk.get_resource_service('products').get(req=None, lookup=lookup))
+        app.cache.set(cache_key, products, timeout=timeout)
+    return products
+
+
+def invalidate_products_cache():
+    """Bump the products data version, so all products related cache entries get outdated"""
+    bump_cache_version(PRODUCTS_CACHE_VERSION_KEY)
 
 
 def _get_navigation_query(ids):
@@ -74,7 +118,7 @@ def get_products_by_navigation(navigation_id, product_type=None):
     if product_type is not None:
         lookup['product_type'] = product_type
 
-    return list(superdesk.get_resource_service('products').get(req=None, lookup=lookup))
+    return get_cached_products(lookup)
 
 
 def get_product_by_id(product_id, product_type=None, company_id=None):
@@ -89,7 +133,7 @@ def get_product_by_id(product_id, product_type=None, company_id=None):
     if product_type is not None:
         lookup['product_type'] = product_type
 
-    return list(superdesk.get_resource_service('products').get(req=None, lookup=lookup))
+    return get_cached_products(lookup)
 
 
 def get_products_by_company(company_id, navigation_id=None, product_type=None):
@@ -105,8 +149,7 @@ def get_products_by_company(company_id, navigation_id=None, product_type=None):
     if product_type:
         lookup['product_type'] = product_type
 
-    products = list(superdesk.get_resource_service('products').get(req=None, lookup=lookup))
-    return products
+    return get_cached_products(lookup)
 
 
 def get_products_dict_by_company(company_id):
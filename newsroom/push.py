@@ -18,6 +18,7 @@ from newsroom.email import send_new_item_notification_email, \
     send_history_match_notification_email, send_item_killed_notification_email
 from newsroom.history import get_history_users
 from newsroom.wire.views import HOME_ITEMS_CACHE_KEY
+from newsroom.search import invalidate_search_cache
 from newsroom.wire import url_for_wire
 from newsroom.upload import ASSETS_RESOURCE
 from newsroom.signals import publish_item as publish_item_signal
@@ -89,6 +90,7 @@ def push():
         flask.abort(400, gettext('Unknown type {}'.format(item.get('type'))))
 
     app.cache.delete(HOME_ITEMS_CACHE_KEY)
+    invalidate_search_cache()
     return flask.jsonify({})
 
 
@@ -1,23 +1,44 @@
 import logging
-from typing import Union
+import functools
+from typing import List, Union
 
-from flask import current_app as app, json, abort
+import orjson
+from flask import current_app as app, json, abort, request
 from flask_babel import gettext
+from eve.methods.get import get_internal
 from eve.utils import ParsedRequest
 from superdesk import get_resource_service
+from superdesk.json_utils import SuperdeskJSONEncoder
 from superdesk.metadata.utils import get_elastic_highlight_query
 from content_api.errors import BadParameterValueError
 
 from newsroom import Service
-from newsroom.products.products import get_products_by_navigation, get_products_by_company, get_product_by_id
+from newsroom.products.products import get_products_by_navigation, get_products_by_company, get_product_by_id, \
+    get_products_cache_version
 from newsroom.auth import get_user
 from newsroom.companies import get_user_company
 from newsroom.settings import get_setting
-from newsroom.template_filters import is_admin
-from newsroom.utils import get_local_date, get_end_date
+from newsroom.template_filters import is_admin, hash_string
+from newsroom.utils import get_local_date, get_end_date, get_cache_version, bump_cache_version, get_cache_timeout
 
 logger = logging.getLogger(__name__)
 
+_json_encoder = SuperdeskJSONEncoder()
+
+SEARCH_CACHE_VERSION_KEY = 'search_cache_version'
+
+# default cache timeouts in sec, used with a shared cache if not configured
+DEFAULT_SEARCH_CACHE_TIMEOUT = 15
+DEFAULT_PRODUCTS_FILTER_CACHE_TIMEOUT = 300
+
+# elastic default for ``indices.query.bool.max_clause_count``
+MAX_CLAUSE_COUNT = 1024
+
+# Item filters added by ``prefill_search_items``, built once and shared by all searches
+_ITEMS_MUST = ({'term': {'_type': 'items'}},)
+_ITEMS_MUST_NOT = ({'term': {'type': 'composite'}},)
+_LATEST_ITEMS_MUST_NOT = _ITEMS_MUST_NOT + ({'constant_score': {'filter': {'exists': {'field': 'nextversion'}}}},)
+
 
 def query_string(query, default_operator='AND'):
     query_string_settings = app.config['ELASTICSEARCH_SETTINGS']['settings']['query_string']
@@ -31,6 +52,77 @@ def query_string(query, default_operator='AND'):
     }
 
 
+def get_search_cache_key(resource):
+    """Get the cache key of the search response for the current user and request args
+
+    Returns ``None`` if search responses should not be cached
+
+    :param str resource: the search resource name
+    """
+    if not get_cache_timeout('SEARCH_CACHE_TIMEOUT', DEFAULT_SEARCH_CACHE_TIMEOUT):
+        return None
+
+    user = get_user()
+    return 'search_{}_{}'.format(resource, hash_string((
+        get_cache_version(SEARCH_CACHE_VERSION_KEY),
+        get_products_cache_version(),
+        str(user['_id']) if user else None,
+        sorted(request.args.items(multi=True)),
+    )))
+
+
+def get_internal_search(resource):
+    """Get the search response for the current request, using the cached one if available
+
+    :param str resource: the search resource name
+    """
+    cache_key = get_search_cache_key(resource)
+    response = app.cache.get(cache_key) if cache_key else None
+    if response is None:
+        response = get_internal(resource)
+        if cache_key:
+            timeout = get_cache_timeout('SEARCH_CACHE_TIMEOUT', DEFAULT_SEARCH_CACHE_TIMEOUT)
+            app.cache.set(cache_key, response, timeout=timeout)
+    return response
+
+
+def invalidate_search_cache():
+    """Invalidate all cached search responses, to be used when items change"""
+    bump_cache_version(SEARCH_CACHE_VERSION_KEY)
+
+
+def _coerce_csv_list(value, name):
+    """Get a list from a list or comma separated string request parameter"""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return value
+    try:
+        return value.split(',')
+    except AttributeError:
+        raise BadParameterValueError('Invalid {} parameter'.format(name))
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_highlight_query(query, analyze_wildcard):
+    """Get the highlight query for body_html, cached as it only depends on the given args.
+
+    The returned dict is shared by all searches, so it must not be modified.
+    """
+    elastic_highlight_query = get_elastic_highlight_query(
+        query_string={
+            "query": query,
+            "default_operator": "AND",
+            "analyze_wildcard": analyze_wildcard,
+            "lenient": True,
+        },
+    )
+    elastic_highlight_query['fields'] = {
+        'body_html': elastic_highlight_query['fields']['body_html']
+    }
+    return elastic_highlight_query
+
+
 class SearchQuery(object):
     """ Class for storing the search parameters for validation and query generation """
 
@@ -66,7 +158,9 @@ class BaseSearchService(Service):
     limit_days_setting: Union[None, str] = 'wire_time_limit_days'
     default_sort = [{'versioncreated': 'desc'}]
     default_page_size = 25
+    cache_products_filter = True  # set to False if ``apply_product_filter`` has other side effects
     _matched_ids = []  # array of IDs matched on the request, used when searching all versions
+    _aggregation_fields = None  # (aggregations, fields) tuple, see ``get_aggregation_fields``
 
     def get(self, req, lookup):
         search = SearchQuery()
@@ -113,64 +207,72 @@ class BaseSearchService(Service):
 
         internal_req = self.get_internal_request(search)
         search_results = self.internal_get(internal_req, search.lookup)
-        next_item_ids = []
-        self._matched_ids = []
+        self._matched_ids = [doc['_id'] for doc in search_results.docs]
 
+        next_item_ids = set()
+        original_ids = set()
+        missing = []
         for doc in search_results.docs:
-            self._matched_ids.append(doc['_id'])
-            next_item_ids.append(str(self.get_last_version(doc)['_id']))
-
-        # Now run a query only using the IDs from the above search
-        # This final search makes sure pagination still works
-        search.query['bool'] = {'must': {'terms': {'_id': next_item_ids}}}
+            if not doc.get('nextversion'):
+                next_item_ids.add(str(doc['_id']))
+            elif doc.get('original_id'):
+                original_ids.add(doc['original_id'])
+            else:
+                missing.append(doc)
+
+        if missing:
+            # Items published prior to ``original_id`` being set, follow their ``nextversion`` chains
+            next_item_ids.update(str(doc['_id']) for doc in self._get_last_versions_by_nextversion(missing).values())
+
+        # Now run a query for the last versions of the matched items
+        # The last versions of items with ``original_id`` are selected in this query as well,
+        # and this final search makes sure pagination still works
+        should: List[dict] = [{'terms': {'_id': list(next_item_ids)}}]
+        if original_ids:
+            should.append({'bool': {
+                'must': {'terms': {'original_id': list(original_ids)}},
+                'must_not': {'exists': {'field': 'nextversion'}},
+            }})
+        search.query['bool'] = {'should': should, 'minimum_should_match': 1}
         self.gen_source_from_search(search)
         internal_req = self.get_internal_request(search)
         return self.internal_get(internal_req, search.lookup)
 
-    def get_last_version(self, doc):
-        if not doc.get('nextversion'):
-            # This is already the latest version
-            return doc
-        elif doc.get('original_id'):
-            # Attempt to get the last version in the series using Elastic
-            original_id = doc['original_id']
-            req = ParsedRequest()
-            req.args = {
-                'source': json.dumps({
-                    'query': {
-                        'bool': {
-                            'must': [
-                                {'term': {'original_id': original_id}},
-                            ],
-                            'must_not': [
-                                {'exists': {'field': 'nextversion'}}
-                            ]
-                        }
-                    }
-                }),
-                'size': 1,
-            }
-            result = self.internal_get(req=req, lookup=None)
-
-            if result.count():
-                return result[0]
+    def _get_last_versions_by_nextversion(self, docs):
+        """Follow the ``nextversion`` chains of all the given items at once, using a single Mongo ``$graphLookup``"""
+
+        source = app.data.datasource(self.datasource)[0]
+        last_by_next_id = {}
+        for next_doc in app.data.get_mongo_collection(source).aggregate([
+            {'$match': {'_id': {'$in': list({doc['nextversion'] for doc in docs})}}},
+            {'$graphLookup': {
+                'from': source,
+                'startWith': '$nextversion',
+                'connectFromField': 'nextversion',
+                'connectToField': '_id',
+                'as': '_chain',
+                'depthField': '_depth',
+            }},
+        ]):
+            chain = next_doc.pop('_chain')
+            last_doc = max(chain, key=lambda chain_doc: chain_doc['_depth']) if chain else next_doc
+            last_doc.pop('_depth', None)
+            if last_doc.get('nextversion'):
+                logger.warning(f'Failed to find the next doc "{last_doc["nextversion"]}" for "{last_doc["_id"]}"')
+            last_by_next_id[next_doc['_id']] = last_doc
+
+        last_versions = {}
+        for doc in docs:
+            if last_by_next_id.get(doc['nextversion']):
+                last_versions[doc['_id']] = last_by_next_id[doc['nextversion']]
             else:
-                logger.warning(f'Failed to find the latest version using `original_id="{original_id}"`')
-
-        # Either the item doesn't have ``original_id`` set, or the elastic query didn't find a match
-        # So we resort to a slower method
-        # This can happen for item's that were published prior to this new feature
-        nextversion_id = doc['nextversion']
-        next_doc = self.find_one(req=None, _id=nextversion_id)
-        if next_doc:
-            return self.get_last_version(next_doc)
-        else:
-            # If, for whatever reason, we can't get the next version return the current one.
-            # That way the request will still be fulfilled,
-            # albeit with this content group cut short in versions
-            item_id = doc['_id']
-            logger.warning(f'Failed to find the next doc "{nextversion_id}" for "{item_id}"')
-            return doc
+                # If, for whatever reason, we can't get the next version return the current one.
+                # That way the request will still be fulfilled,
+                # albeit with this content group cut short in versions
+                logger.warning(f'Failed to find the next doc "{doc["nextversion"]}" for "{doc["_id"]}"')
+                last_versions[doc['_id']] = doc
+
+        return last_versions
 
     def internal_get(self, req, lookup):
         return super().get(req, lookup)
@@ -236,7 +338,11 @@ class BaseSearchService(Service):
         :return:
         """
         internal_req = ParsedRequest()
-        internal_req.args = {'source': json.dumps(search.source)}
+        internal_req.args = {'source': orjson.dumps(
+            search.source,
+            default=_json_encoder.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME,
+        ).decode()}
 
         if search.projections:
             internal_req.args['projections'] = search.projections
@@ -244,8 +350,9 @@ class BaseSearchService(Service):
         return internal_req
 
     def _filter_terms(self, filters):
+        fields = self.get_aggregation_fields()
         return [
-            {'terms': {self.get_aggregation_field(key): val}}
+            {'terms': {fields[key]: val}} if isinstance(val, list) else {'term': {fields[key]: val}}
             for key, val in filters.items()
             if val
         ]
@@ -253,8 +360,23 @@ class BaseSearchService(Service):
     def get_aggregations(self):
         return app.config.get('WIRE_AGGS') or {}
 
+    def get_aggregation_fields(self):
+        """ Get the mapping of aggregation keys to their terms field
+
+        The mapping is built once and reused until the aggregations config is replaced
+        """
+
+        aggregations = self.get_aggregations()
+        if self._aggregation_fields is None or self._aggregation_fields[0] is not aggregations:
+            self._aggregation_fields = (aggregations, {
+                key: agg['terms']['field']
+                for key, agg in aggregations.items()
+                if agg.get('terms')
+            })
+        return self._aggregation_fields[1]
+
     def get_aggregation_field(self, key):
-        return self.get_aggregations()[key]['terms']['field']
+        return self.get_aggregation_fields()[key]
 
     def versioncreated_range(self, created):
         _range = {}
@@ -348,16 +470,7 @@ class BaseSearchService(Service):
         :param SearchQuery search: The search query instance
         """
 
-        if search.args.get('navigation'):
-            navigation = search.args['navigation']
-            if isinstance(navigation, list):
-                search.navigation_ids = navigation
-            elif getattr(navigation, 'split', None):
-                search.navigation_ids = list(navigation.split(','))
-            else:
-                raise BadParameterValueError('Invalid navigation parameter')
-        else:
-            search.navigation_ids = []
+        search.navigation_ids = _coerce_csv_list(search.args.get('navigation'), 'navigation')
 
     def prefill_search_products(self, search):
         """ Prefill the search products
@@ -365,14 +478,7 @@ class BaseSearchService(Service):
         :param SearchQuery search: The search query instance
         """
 
-        if search.args.get('requested_products'):
-            products = search.args['requested_products']
-            if isinstance(products, list):
-                search.requested_products = products
-            elif getattr(products, 'split', None):
-                search.requested_products = list(products.split(','))
-            else:
-                raise BadParameterValueError('Invalid requested_products parameter')
+        search.requested_products = _coerce_csv_list(search.args.get('requested_products'), 'requested_products')
 
         if search.is_admin:
             if len(search.navigation_ids):
@@ -411,30 +517,16 @@ class BaseSearchService(Service):
         :param SearchQuery search: The search query instance
         """
 
-        search.query['bool']['must_not'].append({'term': {'type': 'composite'}})
-        search.query['bool']['must'].append({'term': {'_type': 'items'}})
-        if not search.args.get('ignore_latest', False):
-            search.query['bool']['must_not'].append(
-                {'constant_score': {'filter': {'exists': {'field': 'nextversion'}}}}
-            )
+        search.query['bool']['must'].extend(_ITEMS_MUST)
+        search.query['bool']['must_not'].extend(
+            _ITEMS_MUST_NOT if search.args.get('ignore_latest', False) else _LATEST_ITEMS_MUST_NOT
+        )
 
     def prefill_search_highlights(self, search, req):
         query_string = search.args.get('q')
         query_string_settings = app.config['ELASTICSEARCH_SETTINGS']['settings']['query_string']
         if app.data.elastic.should_highlight(req) and query_string:
-            elastic_highlight_query = get_elastic_highlight_query(
-                query_string={
-                    "query": query_string,
-                    "default_operator": "AND",
-                    "analyze_wildcard": query_string_settings["analyze_wildcard"],
-                    "lenient": True,
-                },
-            )
-            elastic_highlight_query['fields'] = {
-                'body_html': elastic_highlight_query['fields']['body_html']
-            }
-
-            search.highlight = elastic_highlight_query
+            search.highlight = _get_highlight_query(query_string, query_string_settings['analyze_wildcard'])
 
     def validate_request(self, search):
         """ Validate the request parameters
@@ -447,10 +539,11 @@ class BaseSearchService(Service):
                 abort(403, gettext('User does not belong to a company.'))
             elif not len(search.products):
                 abort(403, gettext('Your company doesn\'t have any products defined.'))
-            # If a product list string has been provided it is assumed to be a comma delimited string of product id's
-            elif search.args.get('requested_products'):
+            # Requested products are parsed from a list or a comma delimited string of product id's
+            elif search.requested_products:
                 # Ensure that all the provided products are permissioned for this request
-                if not all(p in [c.get('_id') for c in search.products] for p in search.args['requested_products']):
+                allowed = {str(c.get('_id')) for c in search.products}
+                if not allowed.issuperset(str(_id) for _id in search.requested_products):
                     abort(404, gettext('Invalid product parameter'))
 
     def apply_section_filter(self, search, filters=None):
@@ -504,6 +597,9 @@ class BaseSearchService(Service):
     def apply_products_filter(self, search):
         """ Generate the product filters
 
+        The generated clauses are cached, so following requests for the same products
+        can reuse them without rebuilding
+
         :param SearchQuery search: the search query instance
         """
 
@@ -511,6 +607,15 @@ class BaseSearchService(Service):
             # admin will see everything by default
             return
 
+        cache_key = self.get_products_filter_cache_key(search)
+        cached_filters = app.cache.get(cache_key) if cache_key else None
+        if cached_filters is not None:
+            search.query['bool']['should'].extend(cached_filters)
+            return
+
+        should = search.query['bool']['should']
+        start = len(should)
+
         product_ids = [
             p['sd_product_id']
             for p in search.products
@@ -518,27 +623,73 @@ class BaseSearchService(Service):
         ]
 
         if product_ids:
-            search.query['bool']['should'].append({'terms': {'products.code': product_ids}})
+            should.append({'terms': {'products.code': product_ids}})
+
+        queries = self.get_product_queries(search)
+        for i in range(0, len(queries), MAX_CLAUSE_COUNT):
+            # one query_string for all products, so elastic only parses it once,
+            # using filter context so elastic can cache it for all users of the products
+            should.append({'constant_score': {'filter': query_string(
+                ' OR '.join('({})'.format(query) for query in queries[i:i + MAX_CLAUSE_COUNT])
+            )}})
 
         for product in search.products:
             self.apply_product_filter(search, product)
 
+        if cache_key:
+            timeout = get_cache_timeout('PRODUCTS_FILTER_CACHE_TIMEOUT', DEFAULT_PRODUCTS_FILTER_CACHE_TIMEOUT)
+            app.cache.set(cache_key, should[start:], timeout=timeout)
+
+    def get_products_filter_cache_key(self, search):
+        """ Get the cache key for product filters of the search, ``None`` if these should not be cached
+
+        :param SearchQuery search: the search query instance
+        """
+
+        if not self.cache_products_filter or \
+                not get_cache_timeout('PRODUCTS_FILTER_CACHE_TIMEOUT', DEFAULT_PRODUCTS_FILTER_CACHE_TIMEOUT):
+            return None
+
+        return 'products_filter_{}'.format(hash_string((
+            get_products_cache_version(),
+            [str(p['_id']) for p in search.products],
+            [str(_id) for _id in search.requested_products] or None,
+        )))
+
+    def get_product_queries(self, search):
+        """ Get the queries of the products to filter by
+
+        :param SearchQuery search: The search query instance
+        :return: list of product query strings
+        """
+
+        return [
+            product['query']
+            for product in search.products
+            if product.get('query') and self.is_product_requested(search, product)
+        ]
+
+    def is_product_requested(self, search, product):
+        """ Check if the product is one of the requested products, or no products were requested
+
+        :param SearchQuery search: The search query instance
+        :param dict product: The product to check
+        :return: True if the product should be used to filter the search
+        """
+
+        return not search.requested_products or \
+            str(product['_id']) in {str(_id) for _id in search.requested_products}
+
     def apply_product_filter(self, search, product):
-        """ Generate the filter for a single product
+        """ Apply extra filters for a single product
+
+        Product queries are applied by ``apply_products_filter``
 
         :param SearchQuery search: The search query instance
         :param dict product: The product to filter
         :return:
         """
 
-        if search.args.get('requested_products') and product['_id'] not in search.args['requested_products']:
-            return
-
-        if product.get('query'):
-            search.query['bool']['should'].append(
-                query_string(product['query'])
-            )
-
     def apply_request_filter(self, search):
         if search.args.get('q'):
             search.query['bool']['must'].append(
@@ -561,7 +712,8 @@ class BaseSearchService(Service):
         if not app.config.get('FILTER_BY_POST_FILTER', False):
             if filters:
                 if app.config.get('FILTER_AGGREGATIONS', True):
-                    search.query['bool']['must'] += self._filter_terms(filters)
+                    # exact match filters don't affect scoring, so use filter context which elastic can cache
+                    search.query['bool'].setdefault('filter', []).extend(self._filter_terms(filters))
                 else:
                     search.query['bool']['must'].append(filters)
 
@@ -26,6 +26,9 @@ def update_config(conf):
     conf['BABEL_DEFAULT_TIMEZONE'] = 'Europe/Prague'
     conf['DEFAULT_TIMEZONE'] = 'Europe/Prague'
     conf['NEWS_API_ENABLED'] = True
+    conf['PRODUCTS_FILTER_CACHE_TIMEOUT'] = 0
+    conf['PRODUCTS_CACHE_TIMEOUT'] = 0
+    conf['SEARCH_CACHE_TIMEOUT'] = 0
     return conf
 
 
@@ -18,6 +18,7 @@ from newsroom.auth import get_user_id
 
 DAY_IN_MINUTES = 24 * 60 - 1
 MAX_TERMS_SIZE = 1000
+SHARED_CACHE_TYPES = {'redis', 'rediscluster', 'redissentinel', 'memcached', 'saslmemcached', 'spreadsaslmemcached'}
 
 
 def query_resource(resource, lookup=None, max_results=0, projection=None):
@@ -37,6 +38,45 @@ def get_random_string():
     return str(uuid4())
 
 
+def is_shared_cache():
+    """Test if the configured cache is shared by all the app processes"""
+    # accepts both the old (``redis``) and the class names (``flask_caching.backends.RedisCache``)
+    cache_type = str(app.config.get('CACHE_TYPE') or '').rsplit('.', 1)[-1].lower()
+    if cache_type.endswith('cache'):
+        cache_type = cache_type[:-len('cache')]
+    return cache_type in SHARED_CACHE_TYPES
+
+
+def get_cache_timeout(name, default):
+    """Get the cache timeout configured under given name
+
+    If not configured (``None``), use the default timeout, but only with a shared cache,
+    otherwise invalidation would only reach the current process.
+    """
+    timeout = app.config.get(name)
+    if timeout is None:
+        return default if is_shared_cache() else 0
+    return timeout
+
+
+def get_cache_version(key):
+    """Get the version stored in cache under given key, to be used in cache keys of the versioned data
+
+    The version is seeded on first read, so if it gets evicted from the cache,
+    entries cached for the previous versions are not used again.
+    """
+    version = app.cache.get(key)
+    if not version:
+        app.cache.add(key, get_random_string(), timeout=0)
+        version = app.cache.get(key)
+    return version
+
+
+def bump_cache_version(key):
+    """Set a new version under given key, so all cache entries of the previous version get outdated"""
+    app.cache.set(key, get_random_string(), timeout=0)
+
+
 def json_serialize_datetime_objectId(obj):
     """
     Serialize so that objectid and date are converted to appropriate format.
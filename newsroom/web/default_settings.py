@@ -199,6 +199,15 @@ CACHE_TYPE = os.environ.get('CACHE_TYPE', 'simple')  # in-memory cache
 CACHE_DEFAULT_TIMEOUT = 3600
 # Redis host (used only if CACHE_TYPE is redis)
 CACHE_REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379')
+# The timeouts below are in sec, set to 0 to disable the cache.
+# These caches are invalidated by writing to the cache, so with ``None`` they are only enabled
+# (using the default timeout) if CACHE_TYPE is a cache shared by all the workers (redis, memcached)
+# Timeout of the cached search product filters, 300 by default
+PRODUCTS_FILTER_CACHE_TIMEOUT = None
+# Timeout of the cached products lookups (by company, navigation, id), 60 by default
+PRODUCTS_CACHE_TIMEOUT = None
+# Timeout of the cached search responses (per user and request args), 15 by default
+SEARCH_CACHE_TIMEOUT = None
 
 # Recaptcha Settings
 RECAPTCHA_PUBLIC_KEY = os.environ.get('RECAPTCHA_PUBLIC_KEY')
@@ -1,5 +1,6 @@
 from flask import request, current_app as app
 from newsroom.auth import get_user_id
+from newsroom.search import invalidate_search_cache
 
 
 def get_picture(item):
@@ -36,8 +37,13 @@ def update_action_list(items, action_list, force_insert=False, item_type='items'
             updates = {'$addToSet': {action_list: user_id}}
         else:
             updates = {'$pull': {action_list: user_id}}
+        modified_items = False
         for item_id in items:
             result = db.update_one({'_id': item_id}, updates)
             if result.modified_count:
                 modified = db.find_one({'_id': item_id})
                 elastic.update(item_type, item_id, {action_list: modified[action_list]})
+                modified_items = True
+
+        if modified_items:
+            invalidate_search_cache()
@@ -7,7 +7,6 @@ from bson import ObjectId
 from operator import itemgetter
 from flask import current_app as app, request, jsonify, url_for
 from eve.render import send_response
-from eve.methods.get import get_internal
 from werkzeug.utils import secure_filename
 from flask_babel import gettext
 from superdesk.utc import utcnow
@@ -27,6 +26,7 @@ from newsroom.utils import get_entity_or_404, get_json_or_400, parse_dates, get_
 from newsroom.notifications import push_user_notification, push_notification
 from newsroom.companies import section
 from newsroom.template_filters import is_admin_or_internal
+from newsroom.search import get_internal_search, invalidate_search_cache
 
 from .search import get_bookmarks_count
 from ..upload import ASSETS_RESOURCE
@@ -173,7 +173,7 @@ def bookmarks():
 
 @blueprint.route('/wire/search')
 def search():
-    response = get_internal('wire_search')
+    response = get_internal_search('wire_search')
     return send_response('wire_search', response)
 
 
@@ -304,6 +304,7 @@ def remove_wire_items():
         items_service.on_delete(doc)
 
     items_service.delete({'_id': {'$in': ids}})
+    invalidate_search_cache()
 
     for doc in docs:
         items_service.on_deleted(doc)
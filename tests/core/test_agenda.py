@@ -262,6 +262,18 @@ def test_watch_event(client, app):
     assert 0 == get_bookmarks_count(client, user_id)
 
 
+def test_watch_event_with_search_cache(client, app):
+    app.config['SEARCH_CACHE_TIMEOUT'] = 15
+    user_id = get_admin_user_id(app)
+    assert 0 == get_bookmarks_count(client, user_id)
+
+    post_json(client, '/agenda_watch', {'items': ['urn:conference']})
+    assert 1 == get_bookmarks_count(client, user_id)
+
+    delete_json(client, '/agenda_watch', {'items': ['urn:conference']})
+    assert 0 == get_bookmarks_count(client, user_id)
+
+
 def test_watch_coverages(client, app):
     user_id = get_admin_user_id(app)
 
@@ -12,3 +12,11 @@ def test_json_encoder_handles_objectid(app):
 
 def test_upload_mongo_prefix(app):
     assert 'CONTENTAPI_MONGO' == app.data.mongo.current_mongo_prefix('upload')
+
+
+def test_lazy_setup_of_mail_and_cache(app):
+    assert app._mail is None
+    assert app._cache is None
+    assert app.mail is app.mail
+    assert app.cache is app.cache
+    assert app.extensions['mail'] is not None
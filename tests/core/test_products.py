@@ -2,13 +2,19 @@ from bson import ObjectId
 from flask import json
 from pytest import fixture
 
+from newsroom.products.products import get_products_by_company, get_products_cache_version, \
+    PRODUCTS_CACHE_VERSION_KEY
+from newsroom.utils import get_cache_timeout
 from .test_users import test_login_succeeds_for_admin, init as user_init  # noqa
 
+PRODUCT_ID = ObjectId('59b4c5c61d41c8d736852fbf')
+COMPANY_ID = ObjectId()
+
 
 @fixture(autouse=True)
 def init(app):
     app.data.insert('products', [{
-        '_id': ObjectId('59b4c5c61d41c8d736852fbf'),
+        '_id': PRODUCT_ID,
         'name': 'Sport',
         'description': 'Top level sport product',
         'is_enabled': True,
@@ -94,3 +100,53 @@ def test_gets_all_products(client, app):
     resp = client.get('/products')
     data = json.loads(resp.get_data())
     assert 251 == len(data)
+
+
+def test_products_cache(client, app):
+    test_login_succeeds_for_admin(client)
+    app.config['PRODUCTS_CACHE_TIMEOUT'] = 60
+
+    with app.app_context():
+        products = get_products_by_company(COMPANY_ID)
+        assert [] == products
+
+        original = app.data.find_one('products', req=None, _id=PRODUCT_ID)
+        app.data.update('products', PRODUCT_ID, {'companies': [str(COMPANY_ID)]}, original)
+        assert [] == get_products_by_company(COMPANY_ID)
+
+    resp = client.post('/products/{}'.format(PRODUCT_ID), data=json.dumps({
+        'name': 'Sport',
+        'description': 'foo',
+        'is_enabled': True,
+    }), content_type='application/json')
+    assert 200 == resp.status_code
+
+    with app.app_context():
+        products = get_products_by_company(COMPANY_ID)
+        assert 1 == len(products)
+        assert 'foo' == products[0]['description']
+
+
+def test_products_cache_version(app):
+    with app.app_context():
+        version = get_products_cache_version()
+        assert version
+        assert version == get_products_cache_version()
+
+        # evicted version must not fall back to a value used before
+        app.cache.delete(PRODUCTS_CACHE_VERSION_KEY)
+        assert get_products_cache_version() not in (version, 0, None)
+
+
+def test_products_cache_timeout(app):
+    with app.app_context():
+        app.config['PRODUCTS_CACHE_TIMEOUT'] = None
+        app.config['CACHE_TYPE'] = 'simple'
+        assert 0 == get_cache_timeout('PRODUCTS_CACHE_TIMEOUT', 60)
+
+        for cache_type in ('redis', 'RedisCache', 'flask_caching.backends.RedisCache'):
+            app.config['CACHE_TYPE'] = cache_type
+            assert 60 == get_cache_timeout('PRODUCTS_CACHE_TIMEOUT', 60)
+
+        app.config['PRODUCTS_CACHE_TIMEOUT'] = 0
+        assert 0 == get_cache_timeout('PRODUCTS_CACHE_TIMEOUT', 60)
@@ -12,6 +12,8 @@ from unittest import mock
 from tests.core.test_users import ADMIN_USER_ID
 from superdesk import get_resource_service
 
+from newsroom.search import invalidate_search_cache
+
 
 def test_item_detail(client):
     resp = client.get('/wire/tag:foo')
@@ -162,6 +164,52 @@ def test_search_filters_items_with_updates(client, app):
     assert 'tag:weather' not in [item['_id'] for item in data['_items']]
 
 
+def test_search_all_versions(client, app):
+    app.data.insert('items', [
+        {'_id': 'chain:1', 'original_id': 'chain', 'nextversion': 'chain:2', 'headline': 'chain test'},
+        {'_id': 'chain:2', 'original_id': 'chain', 'headline': 'chain final'},
+    ])
+
+    resp = client.get('/wire/search?all_versions=1&q=service.code:c')
+    data = json.loads(resp.get_data())
+    assert {'urn:localhost:flood', 'urn:localhost:weather'} == {item['_id'] for item in data['_items']}
+    assert 'tag:weather:old' in data['_links']['matched_ids']
+
+    resp = client.get('/wire/search?all_versions=1&q=headline:test')
+    data = json.loads(resp.get_data())
+    assert ['chain:2'] == [item['_id'] for item in data['_items']]
+    assert ['chain:1'] == data['_links']['matched_ids']
+
+
+def test_search_all_versions_without_original_id(client, app):
+    app.data.insert('items', [
+        {'_id': 'nochain:1', 'nextversion': 'nochain:2', 'headline': 'nochain test'},
+        {'_id': 'nochain:2', 'nextversion': 'nochain:3', 'headline': 'nochain update'},
+        {'_id': 'nochain:3', 'headline': 'nochain final'},
+    ])
+
+    resp = client.get('/wire/search?all_versions=1&q=headline:test')
+    data = json.loads(resp.get_data())
+    assert ['nochain:3'] == [item['_id'] for item in data['_items']]
+
+
+def test_search_cache(client, app):
+    app.config['SEARCH_CACHE_TIMEOUT'] = 15
+
+    resp = client.get('/wire/search?q=headline:cached')
+    assert [] == json.loads(resp.get_data())['_items']
+
+    app.data.insert('items', [{'_id': 'cached', 'headline': 'cached'}])
+    resp = client.get('/wire/search?q=headline:cached')
+    assert [] == json.loads(resp.get_data())['_items']
+
+    with app.app_context():
+        invalidate_search_cache()
+
+    resp = client.get('/wire/search?q=headline:cached')
+    assert ['cached'] == [item['_id'] for item in json.loads(resp.get_data())['_items']]
+
+
 def test_search_includes_killed_items(client, app):
     app.data.insert('items', [{'_id': 'foo', 'pubstatus': 'canceled', 'headline': 'killed'}])
     resp = client.get('/wire/search?q=headline:killed')
@@ -653,6 +701,22 @@ def test_wire_delete(client, app):
         assert get_resource_service('items_versions').find_one(req=None, _id_document=doc['_id']) is None
 
 
+def test_wire_delete_with_search_cache(client, app):
+    app.config['SEARCH_CACHE_TIMEOUT'] = 15
+    app.data.insert('items', [{'_id': 'cached', 'headline': 'cached'}])
+
+    resp = client.get('/wire/search?q=headline:cached')
+    assert ['cached'] == [item['_id'] for item in json.loads(resp.get_data())['_items']]
+
+    resp = client.delete('/wire', data=json.dumps({
+        'items': ['cached'],
+    }), content_type='application/json')
+    assert resp.status_code == 200
+
+    resp = client.get('/wire/search?q=headline:cached')
+    assert [] == json.loads(resp.get_data())['_items']
+
+
 def test_highlighting(client, app):
     app.data.insert('items', [{'_id': 'foo', 'body_html': 'Story that involves cheese and onions'}])
     resp = client.get('/wire/search?q=cheese&es_highlight=1')
@@ -1,6 +1,9 @@
 from pytest import fixture, raises
+from bson import ObjectId
 from flask import session, json
 from eve.utils import ParsedRequest
+from werkzeug.exceptions import NotFound
+from superdesk import get_resource_service
 
 from content_api.errors import BadParameterValueError
 
@@ -121,14 +124,14 @@ def test_apply_products_filter(client, app):
 
             service.apply_products_filter(search)
 
-        for product in products:
-            if product.get('query'):
-                assert {'query_string': {
-                    'query': product['query'],
-                    'default_operator': 'AND',
-                    'analyze_wildcard': query_string_settings['analyze_wildcard'],
-                    'lenient': True
-                }} in search.query['bool']['should']
+        queries = [product['query'] for product in products if product.get('query')]
+        if queries:
+            assert {'constant_score': {'filter': {'query_string': {
+                'query': ' OR '.join('({})'.format(query) for query in queries),
+                'default_operator': 'AND',
+                'analyze_wildcard': query_string_settings['analyze_wildcard'],
+                'lenient': True
+            }}}} in search.query['bool']['should']
 
         sd_product_ids = [
             product['sd_product_id']
@@ -153,6 +156,62 @@ def test_apply_products_filter(client, app):
         assert_products_query(PUBLIC_USER_ID, {'navigation': '{},{}'.format(NAV_1, NAV_5)}, [PRODUCTS[0]])
 
 
+def test_apply_products_filter__requested_products(client, app):
+    with app.test_request_context():
+        session['user'] = PUBLIC_USER_ID
+        search = SearchQuery()
+        req = ParsedRequest()
+        req.args = {'requested_products': str(PRODUCTS[0]['_id'])}
+        service.prefill_search_args(search, req)
+        service.prefill_search_query(search, req)
+
+        assert service.get_product_queries(search) == [PRODUCTS[0]['query']]
+        assert service.is_product_requested(search, PRODUCTS[0])
+        assert not service.is_product_requested(search, PRODUCTS[1])
+
+
+def test_validate_request__requested_products(client, app):
+    with app.test_request_context():
+        session['user'] = PUBLIC_USER_ID
+        search = SearchQuery()
+        req = ParsedRequest()
+        req.args = {'requested_products': str(PRODUCTS[0]['_id'])}
+        service.prefill_search_args(search, req)
+        service.prefill_search_query(search, req)
+        service.validate_request(search)
+
+        search = SearchQuery()
+        req.args = {'requested_products': '{},{}'.format(PRODUCTS[0]['_id'], ObjectId())}
+        service.prefill_search_args(search, req)
+        service.prefill_search_query(search, req)
+        with raises(NotFound):
+            service.validate_request(search)
+
+
+def test_apply_products_filter_cache(client, app):
+    app.config['PRODUCTS_FILTER_CACHE_TIMEOUT'] = 300
+
+    def get_products_query():
+        with app.test_request_context():
+            session['user'] = PUBLIC_USER_ID
+            search = SearchQuery()
+            service.prefill_search_args(search)
+            service.prefill_search_query(search)
+            service.apply_products_filter(search)
+            return search.query['bool']['should']
+
+    should = get_products_query()
+    assert {'terms': {'products.code': ['sd_product_1']}} in should
+
+    with app.test_request_context():
+        updates = {'sd_product_id': 'sd_product_2'}
+        app.data.update('products', PRODUCTS[1]['_id'], updates, PRODUCTS[1])
+        assert get_products_query() == should
+
+        get_resource_service('products').on_updated(updates, PRODUCTS[1])
+        assert {'terms': {'products.code': ['sd_product_2']}} in get_products_query()
+
+
 def test_apply_request_filter__query_string(client, app):
     with app.test_request_context():
         query_string_settings = app.config['ELASTICSEARCH_SETTINGS']['settings']['query_string']
@@ -187,12 +246,18 @@ def test_apply_request_filter__filters(client, app):
         search = SearchQuery()
         search.args = {'filter': json.dumps({'service': ['a']})}
         service.apply_request_filter(search)
-        assert {'terms': {'service.name': ['a']}} in search.query['bool']['must']
+        assert {'terms': {'service.name': ['a']}} in search.query['bool']['filter']
 
         search = SearchQuery()
         search.args = {'filter': {'service': ['a']}}
         service.apply_request_filter(search)
-        assert {'terms': {'service.name': ['a']}} in search.query['bool']['must']
+        assert {'terms': {'service.name': ['a']}} in search.query['bool']['filter']
+        assert search.query['bool']['must'] == []
+
+        search = SearchQuery()
+        search.args = {'filter': {'service': 'a'}}
+        service.apply_request_filter(search)
+        assert {'term': {'service.name': 'a'}} in search.query['bool']['filter']
 
         with raises(BadParameterValueError):
             search.args = {'filter': ['test']}
@@ -220,6 +285,15 @@ def test_apply_request_filter__filters(client, app):
         assert {'term': {'service': 'a'}} in search.source['post_filter']['bool']['must']
 
 
+def test_get_aggregation_fields(client, app):
+    with app.app_context():
+        assert service.get_aggregation_field('service') == 'service.name'
+        assert service.get_aggregation_fields() is service.get_aggregation_fields()
+
+        app.config['WIRE_AGGS'] = {'service': {'terms': {'field': 'service.code'}}}
+        assert service.get_aggregation_fields() == {'service': 'service.code'}
+
+
 def test_apply_request_filter__versioncreated(client, app):
     with app.test_request_context():
         app.config['FILTER_BY_POST_FILTER'] = False
@@ -66,6 +66,15 @@ def test_prefill_search_args(client, app):
         assert search.projections == {}
         assert search.req == req
 
+        search = SearchQuery()
+        req = ParsedRequest()
+        req.args = ImmutableMultiDict([('foo', 'bar'), ('foo', 'baz'), ('name', 'test')])
+        service.prefill_search_args(search, req)
+        # args are a plain dict copy of the request args, keeping the first value of each key
+        assert search.args == {'foo': 'bar', 'name': 'test'}
+        search.args['size'] = 10
+        assert req.args.to_dict() == {'foo': 'bar', 'name': 'test'}
+
         search = SearchQuery()
         req = ParsedRequest()
         req.projection = {'service': 1}